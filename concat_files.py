@@ -1,10 +1,47 @@
 #!/usr/bin/env python3
 
+import io
 import os
+import re
 import sys
+import queue
+import stat
+import fnmatch
+import textwrap
+import functools
 import argparse
-from pathlib import Path
-from typing import Dict, List
+import itertools
+import collections
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Pattern
+
+# Chunk size used when the file contents have to be copied through user space.
+COPY_CHUNK_SIZE = 1 << 20
+
+# Input files are opened in windows of this many so the kernel can start
+# reading the upcoming ones while the current one is being written out.
+READAHEAD_WINDOW = 64
+# Only the head of each file is hinted; sequential readahead covers the rest.
+READAHEAD_BYTES = 1 << 20
+
+# With --jobs > 1, reader threads read up to this many files ahead of the
+# writer. Files larger than PREFETCH_MAX_SIZE are not read into memory but
+# streamed into the output when their turn comes.
+PREFETCH_DEPTH = 8
+PREFETCH_MAX_SIZE = 16 << 20
+
+# Output is written through a large buffer so the many small banner writes
+# are coalesced into a few big write() syscalls.
+OUTPUT_BUFFER_SIZE = 4 << 20
+
+HEADER_START = b"===== Directory Structure Header =====\n"
+HEADER_EMPTY = b"(No files matched the filters.)\n"
+HEADER_END = b"======================================\n\n"
+FILE_START = b"===== START OF FILE: %s =====\n"
+FILE_END = b"===== END OF FILE: %s =====\n\n"
+FILE_ERROR = b"[Error reading file: %s]\n"
+
 
 def parse_arguments():
     parser = argparse.ArgumentParser(
@@ -42,65 +79,342 @@ def parse_arguments():
         help="Exclude files with these extensions (multiple allowed). "
              "Example: --exclude ipynb --exclude json"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--include-glob",
+        metavar="PATTERN",
+        action="append",
+        default=None,
+        help="Include only files whose name matches these shell-style patterns "
+             "(multiple allowed, combined with --include). "
+             "Example: --include-glob 'test_*' --include-glob 'Makefile'"
+    )
+    parser.add_argument(
+        "--exclude-glob",
+        metavar="PATTERN",
+        action="append",
+        default=None,
+        help="Exclude files whose name matches these shell-style patterns "
+             "(multiple allowed). Example: --exclude-glob '*_pb2.py'"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Number of threads used to traverse directories with -r and "
+             "to read files ahead while the output is written. Values above 1 "
+             "mainly help on network or other high-latency filesystems. "
+             "Default: 1"
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
 
+def compile_glob_patterns(patterns: Optional[List[str]]) -> Optional[Pattern]:
+    """
+    Compile shell-style glob patterns (e.g. "test_*" or "*.py") into a single
+    regex that matches a file name against any of them, case-sensitively.
+    Each pattern is translated only once, up front. Returns None if there
+    are no patterns.
+    """
+    if not patterns:
+        return None
+    # fnmatch.translate() anchors every pattern at the end already, and
+    # Pattern.match() anchors at the start, so a plain union is enough.
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
 
-def should_include_file(file_path: Path, include_exts, exclude_exts) -> bool:
+
+def should_include_file(
+    name: str,
+    include_exts,
+    exclude_exts,
+    include_glob: Optional[Pattern] = None,
+    exclude_glob: Optional[Pattern] = None
+) -> bool:
     """
-    Decide if a file should be included based on the provided include/exclude lists.
+    Decide if a file should be included based on the provided include/exclude filters.
 
-    - file_path: Path object pointing to a file.
-    - include_exts: A set of extensions to include. If non-empty, only these are included.
-    - exclude_exts: A set of extensions to exclude.
+    - name: The file name (basename) as a plain string, or as bytes.
+    - include_exts: A set of extensions (lowercase, no leading ".") to include.
+    - exclude_exts: A set of extensions (lowercase, no leading ".") to exclude.
+    - include_glob: Pattern from `compile_glob_patterns` for names to include.
+    - exclude_glob: Pattern from `compile_glob_patterns` for names to exclude.
+
+    The filters must be of the same type as `name` (see `_encode_filters`).
+
+    If any include filter is given, a file must match at least one of them
+    (its extension is in `include_exts` or its name matches `include_glob`).
+    A file matching any exclude filter is always skipped.
 
     Returns True if the file should be included, False otherwise.
     """
-    ext = file_path.suffix.lower().lstrip(".")
-    # If `include_exts` is non-empty, only those extensions are allowed.
-    if include_exts and ext not in include_exts:
-        return False
+    # No filters at all (the common case): don't even look at the extension.
+    if not (include_exts or exclude_exts or include_glob or exclude_glob):
+        return True
+    # Same extension as Path(name).suffix (dotfiles like ".json" have none),
+    # but without building a path object or stripping the dot afterwards.
+    if isinstance(name, bytes):
+        idx = name.rfind(b".")
+    else:
+        idx = name.rfind(".")
+    ext = name[idx + 1:].lower() if idx > 0 else name[:0]
+    # If there are include filters, only what they match is allowed.
+    if include_exts or include_glob:
+        ext_included = bool(include_exts) and ext in include_exts
+        if not ext_included and not (include_glob and include_glob.match(name)):
+            return False
     # If the file extension is in `exclude_exts`, skip it.
     if exclude_exts and ext in exclude_exts:
         return False
+    # Same for names matching an exclude glob.
+    if exclude_glob and exclude_glob.match(name):
+        return False
     return True
 
 
+def _encode_filters(include_exts, exclude_exts, include_glob, exclude_glob) -> tuple:
+    """
+    Return bytes versions of the given filters, for matching the bytes file
+    names the directory walk works with. Missing or empty filters become None,
+    the same "no filter" that should_include_file makes of them.
+    Only meant for ASCII names: bytes.lower() and bytes regexes treat every
+    byte as a character.
+    """
+    def encode_exts(exts):
+        return frozenset(os.fsencode(e) for e in exts) if exts else None
+
+    def encode_glob(pattern):
+        if pattern is None:
+            return None
+        # Same regex source as bytes; re.UNICODE is implied for str patterns
+        # but not allowed for bytes ones.
+        return re.compile(os.fsencode(pattern.pattern), pattern.flags & ~re.UNICODE)
+
+    return (encode_exts(include_exts), encode_exts(exclude_exts),
+            encode_glob(include_glob), encode_glob(exclude_glob))
+
+
+# Finds a byte outside ASCII in a bytes file name (bytes.isascii() needs 3.7).
+_NON_ASCII_BYTE = re.compile(rb"[\x80-\xff]")
+
+
+# Source of the directory scanner built by `_compile_scanner`, with the
+# handling of subdirectories and the filter checks filled in.
+_SCANNER_SOURCE = """
+def make_scanner(scandir, fsdecode, non_ascii, include_decoded,
+                 include_exts, exclude_exts, include_glob, exclude_glob):
+    def scan(dirpath, subdirs, found):
+        try:
+            it = scandir(dirpath)
+        except OSError:
+            return
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+{dir_action}
+                    continue
+{filters}
+                try:
+                    is_file = entry.is_file()
+                except OSError:
+                    # e.g. a symlink loop or an unreadable symlink target
+                    continue
+                if is_file:
+                    found.append(entry.path)
+    return scan
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_scanner(include_exts, exclude_exts, include_glob, exclude_glob, recursive: bool):
+    """
+    Build the function that lists a single directory for one filter configuration.
+
+    The returned scan(dirpath, subdirs, found) appends the paths of the
+    subdirectories of `dirpath` to `subdirs` (only if `recursive`) and those of
+    the regular files (or symlinks to them) passing the filters to `found`.
+    Its source is generated and exec()'d per configuration, so the loop over
+    the entries only contains the checks that are actually needed, with the
+    filters bound as closure variables. It applies the same rules as
+    `should_include_file`, which takes the same (hashable) filters.
+
+    Paths are bytes: os.scandir() then hands the names over as-is, without
+    decoding every one of them. ASCII names are checked against bytes copies
+    of the filters (from `_encode_filters`), which behave identically for
+    them. Any other name is decoded and goes through `should_include_file`,
+    so extensions are lowercased and globs match per character, not per byte.
+    DirEntry answers is_dir()/is_file() from d_type, without a stat(), except
+    for symlinks, so the name filters run before is_file().
+    Symlinked directories are not followed, and unreadable directories and
+    entries whose type can't be determined (such as symlink loops) are
+    skipped silently, like os.walk() does.
+    """
+    b_include_exts, b_exclude_exts, b_include_glob, b_exclude_glob = _encode_filters(
+        include_exts, exclude_exts, include_glob, exclude_glob
+    )
+    dir_action = ["subdirs.append(entry.path)"] if recursive else []
+
+    conditions = []  # a file is skipped if any of these holds
+    if b_include_exts and b_include_glob:
+        conditions.append("ext not in include_exts and include_glob(name) is None")
+    elif b_include_exts:
+        conditions.append("ext not in include_exts")
+    elif b_include_glob:
+        conditions.append("include_glob(name) is None")
+    if b_exclude_exts:
+        conditions.append("ext in exclude_exts")
+    if b_exclude_glob:
+        conditions.append("exclude_glob(name) is not None")
+
+    ascii_checks = []
+    if b_include_exts or b_exclude_exts:
+        ascii_checks.append('idx = name.rfind(b".")')
+        ascii_checks.append('ext = name[idx + 1:].lower() if idx > 0 else b""')
+    for condition in conditions:
+        ascii_checks.append(f"if {condition}:")
+        ascii_checks.append("    continue")
+
+    filters = []
+    if conditions:
+        filters.append("name = entry.name")
+        filters.append("if non_ascii(name) is not None:")
+        filters.append("    if not include_decoded(fsdecode(name)):")
+        filters.append("        continue")
+        filters.append("else:")
+        filters.append(textwrap.indent("\n".join(ascii_checks), " " * 4))
+
+    def include_decoded(name: str) -> bool:
+        return should_include_file(name, include_exts, exclude_exts, include_glob, exclude_glob)
+
+    source = _SCANNER_SOURCE.format(
+        dir_action=textwrap.indent("\n".join(dir_action), " " * 20),
+        filters=textwrap.indent("\n".join(filters), " " * 16),
+    )
+    namespace = {}
+    exec(compile(source, "<concat_files scanner>", "exec"), namespace)
+    return namespace["make_scanner"](
+        os.scandir,
+        os.fsdecode,
+        _NON_ASCII_BYTE.search,
+        include_decoded,
+        b_include_exts,
+        b_exclude_exts,
+        b_include_glob.match if b_include_glob else None,
+        b_exclude_glob.match if b_exclude_glob else None,
+    )
+
+
+def _parallel_walk(root: bytes, jobs: int, scan) -> List[bytes]:
+    """
+    Recursively gather the matching files under `root` using `jobs` threads,
+    listing each directory with `scan` (from `_compile_scanner`).
+
+    Every directory is one unit of work on a shared queue: a worker scans it,
+    queues its subdirectories and keeps the matching files in its own list,
+    which are merged at the end. os.scandir() releases the GIL while waiting
+    on the filesystem, so on high-latency storage the listings overlap.
+    """
+    work = queue.Queue()
+    work.put(root)
+    # Directories queued but not fully scanned yet; the walk is over at 0.
+    pending = 1
+    lock = threading.Lock()
+    done = threading.Event()
+    # Set once the caller stops waiting, normally or not (e.g. Ctrl-C).
+    stop = threading.Event()
+
+    def worker() -> List[bytes]:
+        nonlocal pending
+        found = []
+        try:
+            while True:
+                dirpath = work.get()
+                if dirpath is None or stop.is_set():
+                    return found
+                subdirs = []
+                scan(dirpath, subdirs, found)
+                with lock:
+                    pending += len(subdirs) - 1
+                    if pending == 0:
+                        done.set()
+                for d in subdirs:
+                    work.put(d)
+        except BaseException:
+            # Don't leave the caller waiting on a walk that can't finish;
+            # the exception is re-raised from future.result() below.
+            done.set()
+            raise
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(worker) for _ in range(jobs)]
+        try:
+            done.wait()
+        finally:
+            # Wake up every worker even if the wait was interrupted, or
+            # leaving the executor would wait for them forever.
+            stop.set()
+            for _ in futures:
+                work.put(None)
+        gathered = []
+        for future in futures:
+            gathered.extend(future.result())
+    return gathered
+
+
 def gather_files_for_path(
-    path: Path, 
+    path: str, 
     recursive: bool, 
     include_exts, 
-    exclude_exts
-) -> List[Path]:
+    exclude_exts,
+    jobs: int = 1,
+    include_glob=None,
+    exclude_glob=None
+) -> List[str]:
     """
-    Gather a list of files under a single top-level path (file or directory),
-    respecting the recursive flag and include/exclude filters.
-    Returns a list of absolute Paths.
+    Gather a list of files under a single top-level path (an already resolved
+    absolute path string, file or directory), respecting the recursive flag
+    and include/exclude filters.
+    With `recursive` and `jobs` > 1, the directory tree is walked by that many threads.
+    Returns an unsorted list of absolute paths as plain strings.
     """
     gathered = []
 
-    if not path.exists():
+    if not os.path.exists(path):
         print(f"Warning: {path} does not exist. Skipping.", file=sys.stderr)
         return gathered
 
     # If it's a single file, just check if it passes the filters
-    if path.is_file():
-        if should_include_file(path, include_exts, exclude_exts):
-            gathered.append(path.resolve())
+    if os.path.isfile(path):
+        if should_include_file(os.path.basename(path), include_exts, exclude_exts,
+                               include_glob, exclude_glob):
+            gathered.append(path)
         return gathered
 
-    # If it's a directory:
-    if recursive:
-        for root, dirs, files in os.walk(path):
-            for f in files:
-                full_path = Path(root) / f
-                if should_include_file(full_path, include_exts, exclude_exts):
-                    gathered.append(full_path.resolve())
+    # If it's a directory, walk it on bytes paths (see `_compile_scanner`);
+    # only the files that are kept get decoded, once, at the very end.
+    # `path` was resolved once by the caller, so joining names onto it yields
+    # absolute paths without a per-file realpath().
+    # Empty sets mean no filter; frozensets so they can key the scanner cache.
+    include_exts = frozenset(include_exts) if include_exts else None
+    exclude_exts = frozenset(exclude_exts) if exclude_exts else None
+    scan = _compile_scanner(include_exts, exclude_exts, include_glob, exclude_glob, recursive)
+    root = os.fsencode(path)
+    found = []
+    if recursive and jobs > 1:
+        found = _parallel_walk(root, jobs, scan)
     else:
-        for f in path.iterdir():
-            if f.is_file():
-                if should_include_file(f, include_exts, exclude_exts):
-                    gathered.append(f.resolve())
+        # Without `recursive`, scan() never pushes subdirectories.
+        stack = [root]
+        while stack:
+            scan(stack.pop(), stack, found)
 
+    gathered.extend(map(os.fsdecode, found))
     return gathered
 
 
@@ -108,97 +422,340 @@ def gather_all_files(
     paths: List[str],
     recursive: bool,
     include_exts,
-    exclude_exts
-) -> Dict[Path, List[Path]]:
+    exclude_exts,
+    jobs: int = 1,
+    include_glob=None,
+    exclude_glob=None
+) -> Dict[str, List[str]]:
     """
     For each top-level path provided by the user, gather all matching files
-    (absolute Paths) and store them in a dictionary keyed by the top-level Path (resolved).
+    (absolute path strings, unsorted) and store them in a dictionary keyed by
+    the resolved top-level path.
+    `jobs` is the number of threads used to walk each directory tree.
 
     Example return structure:
     {
-      Path('/abs/path/to/dirA'): [Path('/abs/path/to/dirA/file1.txt'), ...],
-      Path('/abs/path/to/some_file.py'): [Path('/abs/path/to/some_file.py')]
+      '/abs/path/to/dirA': ['/abs/path/to/dirA/file1.txt', ...],
+      '/abs/path/to/some_file.py': ['/abs/path/to/some_file.py']
     }
     """
     results = {}
     for p in paths:
-        top_path = Path(p).resolve()
-        files = gather_files_for_path(top_path, recursive, include_exts, exclude_exts)
-        results[top_path] = sorted(files, key=lambda x: str(x))
+        top_path = os.path.realpath(p)
+        results[top_path] = gather_files_for_path(
+            top_path, recursive, include_exts, exclude_exts, jobs,
+            include_glob, exclude_glob
+        )
     return results
 
 
 def build_directory_structure_for_files(
-    top_path: Path, 
-    files: List[Path]
-) -> List[str]:
+    top_path: str, 
+    files: List[str]
+) -> Iterator[str]:
     """
-    Given a single top-level path and a list of *absolute* file paths under it,
-    build a mini "tree" (list of lines) showing their structure relative to top_path.
+    Given a single top-level path and a list of *absolute* file paths under it
+    (in any order), generate the lines of a mini "tree" showing their structure
+    relative to top_path. Lines are yielded one by one so they can be written
+    out without collecting the whole header first.
 
     If top_path is a file, we just show that file name (if it was included).
     If top_path is a directory, we show a tree structure from top_path down.
     """
-    lines = []
-
-    if top_path.is_file():
+    if os.path.isfile(top_path):
         # top_path is already in `files` if it was included
         # Just show the file name, no sub-tree
         if len(files) == 1:  # The top_path itself
-            lines.append(str(top_path.name))
+            yield os.path.basename(top_path)
         elif len(files) > 1:
             # Very unusual edge case: user passed a file path that somehow matched multiple?
             # Realistically that won't happen, but let's handle gracefully
-            lines.extend(str(f.name) for f in files)
-        return lines
+            yield from sorted(os.path.basename(f) for f in files)
+        return
+
+    # If it's a directory, print the tree in a single pass over the files
+    # sorted the way it is displayed: at every level subdirectories first,
+    # then files, each alphabetically. Only the directories that differ
+    # from the previous file's ones need to be printed.
+    def tree_order(parts):
+        return [(0, d) for d in parts[:-1]] + [(1, parts[-1])]
+
+    # Everything in `files` starts with top_path, so slicing it off gives the
+    # path relative to top_path.
+    prefix_len = len(os.path.join(top_path, ""))
+    all_parts = sorted((f[prefix_len:].split(os.sep) for f in files), key=tree_order)
+
+    yield f"{os.path.basename(top_path)}/"  # Start with the directory name
+    prev_dirs = ()
+    for parts in all_parts:
+        dirs = parts[:-1]
+        common = 0
+        for prev, cur in zip(prev_dirs, dirs):
+            if prev != cur:
+                break
+            common += 1
+        for depth in range(common, len(dirs)):
+            yield f"{'  ' * (depth + 1)}{dirs[depth]}/"
+        yield f"{'  ' * (len(dirs) + 1)}{parts[-1]}"
+        prev_dirs = dirs
+
+
+def choose_copy_method(out_f) -> str:
+    """
+    Pick how file contents are copied into `out_f`, based on what it is backed by:
+    "sendfile" for a regular file, "splice" for a pipe (Linux, Python 3.10+),
+    or "copy" (through user space) for anything else.
+    """
+    try:
+        mode = os.fstat(out_f.fileno()).st_mode
+    except (AttributeError, ValueError, OSError, io.UnsupportedOperation):
+        return "copy"
+    if stat.S_ISREG(mode) and hasattr(os, "sendfile"):
+        return "sendfile"
+    if stat.S_ISFIFO(mode) and hasattr(os, "splice"):
+        return "splice"
+    return "copy"
+
+
+def open_input(fpath: str) -> int:
+    """
+    Open an input file for reading and return the raw file descriptor.
+
+    Plain os.open() is all the copy paths need: it is a single openat(),
+    whereas open(fpath, "rb") also stats the file, probes whether it is a
+    terminal and sets up a buffered file object around it.
+    """
+    return os.open(fpath, os.O_RDONLY | getattr(os, "O_BINARY", 0))
 
-    # If it's a directory, build a structure
-    # Approach: a nested dict from the relative paths
-    tree = {}
-    for f in files:
-        relative = f.relative_to(top_path)  # path from top_path
-        parts = relative.parts
-        current = tree
-        for part in parts[:-1]:
-            current = current.setdefault(part, {})
-        current.setdefault("_files", []).append(parts[-1])
 
-    lines.append(f"{top_path.name}/")  # Start with the directory name
-    _print_tree(tree, indent="  ", lines=lines)
-    return lines
+def copy_file_contents(in_fd: int, out_f, method: str = "copy") -> None:
+    """
+    Copy the full contents of the file open as `in_fd` into the binary stream `out_f`.
+
+    `method` comes from `choose_copy_method`. With "sendfile" or "splice" the
+    bytes are moved kernel-side and never enter Python. Otherwise, or if the
+    kernel refuses this particular input, fall back to chunked reads. (No mmap
+    here: a file truncated while mapped would kill the process with SIGBUS,
+    where a read() simply ends early or fails into an error line.)
+    The file position of `in_fd` is not relied upon and stays at the start
+    until the chunked fallback.
+    """
+    size = os.fstat(in_fd).st_size
+    if method == "sendfile":
+        # Anything still sitting in the buffer has to land before the file body.
+        out_f.flush()
+        out_fd = out_f.fileno()
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                if sent == 0:
+                    # The file shrank underneath us; nothing more to copy.
+                    break
+                offset += sent
+        except OSError:
+            # Some inputs (e.g. certain pseudo files) can't be sendfile'd.
+            # Only fall back if nothing was copied yet, otherwise re-raise.
+            if offset:
+                raise
+        else:
+            if size:
+                return
+    elif method == "splice":
+        out_f.flush()
+        out_fd = out_f.fileno()
+        offset = 0
+        try:
+            # Pages are moved from the page cache into the pipe, until EOF.
+            while True:
+                moved = os.splice(in_fd, out_fd, COPY_CHUNK_SIZE, offset_src=offset,
+                                  flags=os.SPLICE_F_MOVE | os.SPLICE_F_MORE)
+                if moved == 0:
+                    break
+                offset += moved
+        except OSError:
+            # Same as above: fall back only if nothing was copied yet.
+            if offset:
+                raise
+        else:
+            if offset:
+                return
+
+    while True:
+        chunk = os.read(in_fd, COPY_CHUNK_SIZE)
+        if not chunk:
+            break
+        out_f.write(chunk)
+
+
+def open_with_readahead(paths: List[str]) -> list:
+    """
+    Open a window of input files up front and hint the kernel (POSIX_FADV_WILLNEED)
+    to start reading all of them in the background, so their read latency
+    overlaps instead of being paid one file at a time.
+
+    Returns a list aligned with `paths` holding either a file descriptor from
+    `open_input` or the exception raised while trying to open that path.
+    Each descriptor is opened exactly once and used for both the hint and
+    the copy.
+    """
+    opened = []
+    for p in paths:
+        try:
+            opened.append(open_input(p))
+        except Exception as e:
+            opened.append(e)
+
+    # A lone file is read right away, so a hint would only cost a syscall.
+    if len(opened) > 1 and hasattr(os, "posix_fadvise"):
+        for in_fd in opened:
+            if isinstance(in_fd, Exception):
+                continue
+            try:
+                os.posix_fadvise(in_fd, 0, READAHEAD_BYTES, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                # Purely advisory; some filesystems don't support it.
+                pass
+    return opened
 
 
-def _print_tree(node: dict, indent: str, lines: List[str]):
+def write_files(all_files: List[str], out_f, copy_method: str):
     """
-    Recursively print the directory structure from a nested dictionary.
-    A node's subdirs are all keys except "_files".
+    Write every file in `all_files`, between its start/end banners, into `out_f`.
+    Files that can't be read get an error line instead of their contents.
     """
-    subdirs = [k for k in node.keys() if k != "_files"]
-    subdirs.sort()
-    for d in subdirs:
-        lines.append(f"{indent}{d}/")
-        _print_tree(node[d], indent + "  ", lines)
+    for start in range(0, len(all_files), READAHEAD_WINDOW):
+        window = all_files[start:start + READAHEAD_WINDOW]
+        opened = open_with_readahead(window)
+        try:
+            for i, fpath in enumerate(window):
+                in_fd = opened[i]
+                fpath_b = os.fsencode(fpath)
+                out_f.write(FILE_START % fpath_b)
+                try:
+                    if isinstance(in_fd, Exception):
+                        raise in_fd
+                    # Forget the descriptor before closing it, so it can't be
+                    # closed twice (and hit a reused fd number) below.
+                    opened[i] = None
+                    try:
+                        copy_file_contents(in_fd, out_f, copy_method)
+                    finally:
+                        os.close(in_fd)
+                except Exception as e:
+                    out_f.write(FILE_ERROR % os.fsencode(str(e)))
+                out_f.write(FILE_END % fpath_b)
+        finally:
+            # Don't leak the rest of the window if writing the output failed.
+            for in_fd in opened:
+                if isinstance(in_fd, int):
+                    os.close(in_fd)
+
+
+def read_for_prefetch(fpath: str):
+    """
+    Open `fpath` and, if it is at most PREFETCH_MAX_SIZE bytes, read it whole.
 
-    if "_files" in node:
-        files = node["_files"]
-        files.sort()
-        for f in files:
-            lines.append(f"{indent}{f}")
+    Returns the contents as bytes, or for larger files the open file descriptor,
+    which the caller streams with `copy_file_contents` and then closes.
+    """
+    in_fd = open_input(fpath)
+    try:
+        size = os.fstat(in_fd).st_size
+        if size > PREFETCH_MAX_SIZE:
+            return in_fd
+        # Normally one read for the contents and one to see EOF.
+        chunks = []
+        while True:
+            chunk = os.read(in_fd, max(size, COPY_CHUNK_SIZE))
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except BaseException:
+        os.close(in_fd)
+        raise
+    os.close(in_fd)
+    return b"".join(chunks)
+
+
+def write_files_prefetched(all_files: List[str], out_f, copy_method: str, jobs: int):
+    """
+    Same output as `write_files`, but `jobs` reader threads read up to
+    PREFETCH_DEPTH files ahead, so reading the next files overlaps with
+    writing the current one. Files are still written in `all_files` order.
+    """
+    files = iter(all_files)
+    # (path, future) pairs, oldest first; bounded to cap the memory held.
+    pending = collections.deque()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for fpath in itertools.islice(files, PREFETCH_DEPTH):
+            pending.append((fpath, executor.submit(read_for_prefetch, fpath)))
+        try:
+            while pending:
+                fpath, future = pending[0]
+                for next_path in itertools.islice(files, 1):
+                    pending.append((next_path, executor.submit(read_for_prefetch, next_path)))
+
+                fpath_b = os.fsencode(fpath)
+                out_f.write(FILE_START % fpath_b)
+                # Only now is the file taken out of `pending`: from here on,
+                # closing what was read is up to this iteration.
+                pending.popleft()
+                try:
+                    contents = future.result()
+                    if isinstance(contents, bytes):
+                        out_f.write(contents)
+                    else:
+                        try:
+                            copy_file_contents(contents, out_f, copy_method)
+                        finally:
+                            os.close(contents)
+                except Exception as e:
+                    out_f.write(FILE_ERROR % os.fsencode(str(e)))
+                out_f.write(FILE_END % fpath_b)
+        finally:
+            # Only reached with work left if writing the output failed:
+            # drop what hasn't started and close large files left open.
+            for _, future in pending:
+                if not future.cancel() and future.exception() is None:
+                    contents = future.result()
+                    if not isinstance(contents, bytes):
+                        os.close(contents)
+
+
+def open_stdout_binary():
+    """
+    Return a binary stream writing to STDOUT through a buffer of OUTPUT_BUFFER_SIZE.
+    Closing it flushes the buffer but leaves the STDOUT file descriptor open.
+    """
+    sys.stdout.flush()
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        # STDOUT was replaced by something without a file descriptor.
+        return sys.stdout.buffer
+    return io.BufferedWriter(io.FileIO(fd, "wb", closefd=False), OUTPUT_BUFFER_SIZE)
 
 
 def main():
     args = parse_arguments()
 
     # Prepare sets of included or excluded extensions (lowercase, no leading ".")
-    include_exts = set(e.lower().lstrip(".") for e in args.include) if args.include else None
-    exclude_exts = set(e.lower().lstrip(".") for e in args.exclude) if args.exclude else None
+    include_exts = frozenset(e.lower().lstrip(".") for e in args.include) if args.include else None
+    exclude_exts = frozenset(e.lower().lstrip(".") for e in args.exclude) if args.exclude else None
+    # Glob patterns are translated and compiled into one regex each, up front
+    include_glob = compile_glob_patterns(args.include_glob)
+    exclude_glob = compile_glob_patterns(args.exclude_glob)
 
     # 1. Gather files per top-level path
     file_dict = gather_all_files(
         args.paths,
         recursive=args.recursive,
         include_exts=include_exts,
-        exclude_exts=exclude_exts
+        exclude_exts=exclude_exts,
+        jobs=args.jobs,
+        include_glob=include_glob,
+        exclude_glob=exclude_glob
     )
 
     # If the output path already exists inside one of the supplied directories,
@@ -206,7 +763,7 @@ def main():
     # when running the tool multiple times with the output file located inside
     # an input directory.
     if args.output:
-        output_path = Path(args.output).resolve()
+        output_path = os.path.realpath(args.output)
         for top, files in list(file_dict.items()):
             filtered = [f for f in files if f != output_path]
             file_dict[top] = filtered
@@ -215,24 +772,23 @@ def main():
             if not filtered and top == output_path:
                 del file_dict[top]
 
-    # Create one combined list of all files for concatenation
-    all_files = []
-    for file_list in file_dict.values():
-        all_files.extend(file_list)
-
-    # Remove duplicates (same file may appear under multiple paths) and
-    # sort the result for consistent ordering
-    all_files = sorted(set(all_files), key=lambda x: str(x))
+    # Create one combined list of all files for concatenation. Remove
+    # duplicates (same file may appear under multiple paths) and sort once,
+    # by plain string comparison, for consistent ordering.
+    all_files = sorted(set(itertools.chain.from_iterable(file_dict.values())))
 
     # 2. Open output destination (file or stdout)
+    # Everything is written in binary mode: file contents are passed through
+    # untouched and the banners are plain ASCII.
     if args.output:
-        out_f = open(args.output, "w", encoding="utf-8", errors="replace")
+        out_f = open(args.output, "wb", buffering=OUTPUT_BUFFER_SIZE)
     else:
-        out_f = sys.stdout
+        out_f = open_stdout_binary()
+    copy_method = choose_copy_method(out_f)
 
     try:
         # 3. Write the header
-        out_f.write("===== Directory Structure Header =====\n")
+        out_f.write(HEADER_START)
         something_printed = False
 
         for top_path, files in file_dict.items():
@@ -243,27 +799,25 @@ def main():
             something_printed = True
             # Print a small label for each top-level path
             # or skip if it's clearly a single item?
-            lines = build_directory_structure_for_files(top_path, files)
-            for line in lines:
-                out_f.write(line + "\n")
+            for line in build_directory_structure_for_files(top_path, files):
+                out_f.write(os.fsencode(line))
+                out_f.write(b"\n")
         if not something_printed:
-            out_f.write("(No files matched the filters.)\n")
+            out_f.write(HEADER_EMPTY)
 
-        out_f.write("======================================\n\n")
+        out_f.write(HEADER_END)
 
         # 4. Concatenate each file
-        for fpath in all_files:
-            out_f.write(f"===== START OF FILE: {fpath} =====\n")
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="replace") as in_f:
-                    for line in in_f:
-                        out_f.write(line)
-            except Exception as e:
-                out_f.write(f"[Error reading file: {e}]\n")
-            out_f.write(f"===== END OF FILE: {fpath} =====\n\n")
+        if args.jobs > 1:
+            write_files_prefetched(all_files, out_f, copy_method, args.jobs)
+        else:
+            write_files(all_files, out_f, copy_method)
 
     finally:
-        if out_f is not sys.stdout:
+        if out_f is sys.stdout.buffer:
+            out_f.flush()
+        else:
+            # Flushes the buffer; our STDOUT wrapper leaves fd 1 open.
             out_f.close()
 
     # If we wrote to a file, let the user know
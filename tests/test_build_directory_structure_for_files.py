@@ -0,0 +1,29 @@
+from concat_files import build_directory_structure_for_files
+
+
+def test_tree_lists_subdirectories_before_files(tmp_path):
+    top = tmp_path / 'proj'
+    top.mkdir()
+    files = [str(top / rel) for rel in (
+        'z.py', 'a.py', 'src/util/helpers.py', 'src/main.py', 'docs/index.md',
+        'src-old/legacy.py',
+    )]
+    assert list(build_directory_structure_for_files(str(top), files)) == [
+        'proj/',
+        '  docs/',
+        '    index.md',
+        '  src/',
+        '    util/',
+        '      helpers.py',
+        '    main.py',
+        '  src-old/',
+        '    legacy.py',
+        '  a.py',
+        '  z.py',
+    ]
+
+
+def test_tree_for_single_file(tmp_path):
+    top = tmp_path / 'notes.txt'
+    top.write_text('hi')
+    assert list(build_directory_structure_for_files(str(top), [str(top)])) == ['notes.txt']
@@ -0,0 +1,115 @@
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from concat_files import compile_glob_patterns, gather_files_for_path, should_include_file
+
+
+def _make_tree(root: Path):
+    (root / 'pkg' / 'sub').mkdir(parents=True)
+    (root / 'docs').mkdir()
+    for rel in ('top.py', 'notes.txt', 'pkg/a.py', 'pkg/sub/b.py',
+                'pkg/sub/data.json', 'docs/index.md'):
+        (root / rel).write_text(rel)
+    # Symlinked directories are not followed
+    os.symlink(root / 'pkg', root / 'pkg_link')
+
+
+def test_recursive_gather_with_filters(tmp_path):
+    _make_tree(tmp_path)
+    include = {'py'}
+    files = gather_files_for_path(str(tmp_path), True, include, None)
+    assert sorted(files) == [
+        str(tmp_path / 'pkg' / 'a.py'),
+        str(tmp_path / 'pkg' / 'sub' / 'b.py'),
+        str(tmp_path / 'top.py'),
+    ]
+
+
+def test_parallel_walk_matches_serial_walk(tmp_path):
+    _make_tree(tmp_path)
+    exclude = {'json'}
+    serial = gather_files_for_path(str(tmp_path), True, None, exclude)
+    parallel = gather_files_for_path(str(tmp_path), True, None, exclude, jobs=4)
+    assert sorted(parallel) == sorted(serial)
+    assert len(serial) == 5
+
+
+@pytest.mark.parametrize('include_exts', [None, {'py', 'md'}, {'äb'}])
+@pytest.mark.parametrize('exclude_exts', [None, {'json', 'md'}])
+@pytest.mark.parametrize('include_glob', [None, ['READ*', '*.txt'], ['?.py']])
+@pytest.mark.parametrize('exclude_glob', [None, ['*_test.*'], ['[é]*']])
+def test_scanner_agrees_with_should_include_file(
+        tmp_path, include_exts, exclude_exts, include_glob, exclude_glob):
+    names = ['a.py', 'B.PY', 'a_test.py', 'README', 'notes.txt', 'x.md',
+             'data.json', '.py', 'noext', 'archive.tar.gz',
+             # Non-ASCII names: lowercasing and ?/[...] work per character
+             'é.py', 'x.ÄB', 'ÉTÉ.TXT', 'ab.py']
+    for name in names:
+        (tmp_path / name).write_text(name)
+    include_glob = compile_glob_patterns(include_glob)
+    exclude_glob = compile_glob_patterns(exclude_glob)
+
+    expected = sorted(
+        str(tmp_path / name) for name in names
+        if should_include_file(name, include_exts, exclude_exts, include_glob, exclude_glob)
+    )
+    files = gather_files_for_path(str(tmp_path), False, include_exts, exclude_exts,
+                                  include_glob=include_glob, exclude_glob=exclude_glob)
+    assert sorted(files) == expected
+
+
+def test_empty_filter_sets_mean_no_filter(tmp_path):
+    _make_tree(tmp_path)
+    # Same as should_include_file('top.py', set(), None), which is True
+    files = gather_files_for_path(str(tmp_path), False, set(), set())
+    assert sorted(files) == [str(tmp_path / 'notes.txt'), str(tmp_path / 'top.py')]
+
+
+@pytest.mark.parametrize('recursive, jobs', [(False, 1), (True, 1), (True, 4)])
+def test_symlink_loop_is_skipped(tmp_path, recursive, jobs):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'sub' / 'b.txt').write_text('b')
+    os.symlink('loop', tmp_path / 'loop')
+    os.symlink('loop', tmp_path / 'sub' / 'loop')
+    files = gather_files_for_path(str(tmp_path), recursive, None, None, jobs=jobs)
+    expected = [str(tmp_path / 'a.txt')]
+    if recursive:
+        expected.append(str(tmp_path / 'sub' / 'b.txt'))
+    assert sorted(files) == expected
+
+
+@pytest.mark.skipif(not hasattr(signal, 'setitimer'), reason='signal.setitimer is not available')
+def test_interrupted_parallel_walk_returns():
+    # Run in a subprocess, so that a walk which never returns fails the test
+    # through the timeout instead of hanging the test run.
+    code = textwrap.dedent("""
+        import signal, time
+        from concat_files import _parallel_walk
+
+        def scan(dirpath, subdirs, found):
+            time.sleep(0.001)
+            subdirs.append(dirpath + b'/d')  # an endless tree
+
+        def interrupt(signum, frame):
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGALRM, interrupt)
+        signal.setitimer(signal.ITIMER_REAL, 0.2)
+        try:
+            _parallel_walk(b'/', 4, scan)
+        except KeyboardInterrupt:
+            print('interrupted')
+    """)
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=str(Path(__file__).resolve().parent.parent),
+        stdout=subprocess.PIPE, timeout=30,
+    )
+    assert result.returncode == 0
+    assert result.stdout.strip() == b'interrupted'
@@ -1,27 +1,42 @@
-import pathlib
-
-from concat_files import should_include_file
+from concat_files import compile_glob_patterns, should_include_file
 
 
 def test_inclusion_with_include_set():
-    path = pathlib.Path('example.txt')
     include = {'txt', 'md'}
-    assert should_include_file(path, include, None) is True
+    assert should_include_file('example.txt', include, None) is True
 
 
 def test_exclusion_with_exclude_set():
-    path = pathlib.Path('example.log')
     exclude = {'log', 'tmp'}
-    assert should_include_file(path, None, exclude) is False
+    assert should_include_file('example.log', None, exclude) is False
 
 
 def test_include_and_exclude_sets():
     include = {'txt', 'md'}
     exclude = {'md'}
-    path_md = pathlib.Path('doc.md')
-    path_txt = pathlib.Path('doc.txt')
 
     # File extension present in both include and exclude -> excluded
-    assert should_include_file(path_md, include, exclude) is False
+    assert should_include_file('doc.md', include, exclude) is False
     # File extension only in include -> included
-    assert should_include_file(path_txt, include, exclude) is True
+    assert should_include_file('doc.txt', include, exclude) is True
+
+
+def test_extension_match_is_case_insensitive():
+    include = {'py'}
+    assert should_include_file('Setup.PY', include, None) is True
+    # Dotfiles have no extension, just like Path('.py').suffix == ''
+    assert should_include_file('.py', include, None) is False
+    assert should_include_file('script.pyc', include, None) is False
+
+
+def test_glob_patterns():
+    include_glob = compile_glob_patterns(['test_*', 'Makefile'])
+    exclude_glob = compile_glob_patterns(['*_pb2.py'])
+
+    assert should_include_file('test_io.c', None, None, include_glob) is True
+    assert should_include_file('Makefile', None, None, include_glob) is True
+    assert should_include_file('main.c', None, None, include_glob) is False
+    # Extension and glob includes are combined: matching either is enough
+    assert should_include_file('main.py', {'py'}, None, include_glob) is True
+    # Excludes win over includes
+    assert should_include_file('msg_pb2.py', {'py'}, None, None, exclude_glob) is False
@@ -0,0 +1,150 @@
+import errno
+import io
+import os
+import threading
+
+import pytest
+
+import concat_files
+from concat_files import write_files, write_files_prefetched
+
+
+def _make_files(tmp_path):
+    paths = []
+    for i in range(20):
+        p = tmp_path / f'f{i:02d}.txt'
+        p.write_bytes(f'line {i}\n'.encode() * (i + 1))
+        paths.append(str(p))
+    big = tmp_path / 'big.bin'
+    big.write_bytes(bytes(range(256)) * 64)
+    paths.append(str(big))
+    paths.append(str(tmp_path / 'missing.txt'))
+    return paths
+
+
+def test_serial_output(tmp_path):
+    paths = _make_files(tmp_path)
+    out = io.BytesIO()
+    write_files(paths[:1], out, 'copy')
+    assert out.getvalue() == (
+        f'===== START OF FILE: {paths[0]} =====\n'
+        'line 0\n'
+        f'===== END OF FILE: {paths[0]} =====\n\n'
+    ).encode()
+
+
+def test_prefetched_output_matches_serial(tmp_path, monkeypatch):
+    paths = _make_files(tmp_path)
+    # Make big.bin take the streaming path instead of being read whole
+    monkeypatch.setattr(concat_files, 'PREFETCH_MAX_SIZE', 4096)
+
+    serial = io.BytesIO()
+    write_files(paths, serial, 'copy')
+    prefetched = io.BytesIO()
+    write_files_prefetched(paths, prefetched, 'copy', jobs=3)
+
+    assert prefetched.getvalue() == serial.getvalue()
+    assert b'[Error reading file:' in serial.getvalue()
+
+
+class _FailingWriter(io.BytesIO):
+    def write(self, data):
+        raise OSError(errno.ENOSPC, 'No space left on device')
+
+
+def test_prefetched_closes_large_files_when_writing_fails(tmp_path, monkeypatch):
+    paths = _make_files(tmp_path)
+    big = [p for p in paths if p.endswith('big.bin')]
+    monkeypatch.setattr(concat_files, 'PREFETCH_MAX_SIZE', 4096)
+    opened = []
+
+    def recording_open_input(fpath):
+        fd = real_open_input(fpath)
+        opened.append(fd)
+        return fd
+
+    real_open_input = concat_files.open_input
+    monkeypatch.setattr(concat_files, 'open_input', recording_open_input)
+    with pytest.raises(OSError):
+        write_files_prefetched(big + paths[:3], _FailingWriter(), 'copy', jobs=2)
+
+    # big.bin at least; reads that hadn't started are cancelled
+    assert opened
+    for fd in opened:
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
+
+def test_large_file_is_copied_in_chunks(tmp_path, monkeypatch):
+    paths = _make_files(tmp_path)
+    big = [p for p in paths if p.endswith('big.bin')]
+    monkeypatch.setattr(concat_files, 'COPY_CHUNK_SIZE', 1000)
+
+    out = io.BytesIO()
+    write_files(big, out, 'copy')
+    with open(big[0], 'rb') as f:
+        assert f.read() in out.getvalue()
+
+
+@pytest.mark.skipif(not hasattr(os, 'sendfile'), reason='os.sendfile is not available')
+def test_sendfile_output_matches_copy(tmp_path):
+    paths = _make_files(tmp_path)
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    paths.insert(3, str(empty))
+
+    expected = io.BytesIO()
+    write_files(paths, expected, 'copy')
+    # Banners go through the buffer, bodies straight to the fd: the buffer
+    # must be flushed in between or the output gets out of order.
+    out_path = tmp_path / 'out' / 'concat.txt'
+    out_path.parent.mkdir()
+    with open(out_path, 'wb', buffering=concat_files.OUTPUT_BUFFER_SIZE) as out:
+        write_files(paths, out, 'sendfile')
+
+    assert out_path.read_bytes() == expected.getvalue()
+
+
+def _write_files_to_pipe(paths, method):
+    """Run write_files into an os.pipe(), drained by a thread, and return the bytes."""
+    read_fd, write_fd = os.pipe()
+    received = []
+
+    def drain():
+        with open(read_fd, 'rb') as pipe_in:
+            received.append(pipe_in.read())
+
+    reader = threading.Thread(target=drain)
+    reader.start()
+    try:
+        with open(write_fd, 'wb', buffering=concat_files.OUTPUT_BUFFER_SIZE) as out:
+            assert concat_files.choose_copy_method(out) == method
+            write_files(paths, out, method)
+    finally:
+        reader.join()
+    return received[0]
+
+
+needs_splice = pytest.mark.skipif(not hasattr(os, 'splice'), reason='os.splice is not available')
+
+
+@needs_splice
+def test_splice_output_matches_copy(tmp_path):
+    paths = _make_files(tmp_path)
+    expected = io.BytesIO()
+    write_files(paths, expected, 'copy')
+
+    assert _write_files_to_pipe(paths, 'splice') == expected.getvalue()
+
+
+@needs_splice
+def test_splice_falls_back_when_input_cannot_be_spliced(tmp_path, monkeypatch):
+    paths = _make_files(tmp_path)
+    expected = io.BytesIO()
+    write_files(paths, expected, 'copy')
+
+    def refuse_splice(*args, **kwargs):
+        raise OSError(errno.EINVAL, 'Invalid argument')
+
+    monkeypatch.setattr(os, 'splice', refuse_splice)
+    assert _write_files_to_pipe(paths, 'splice') == expected.getvalue()